@@ -40,5 +40,8 @@ app.layout = html.Div(className="layout-container", children=[
 
 register_callbacks(app)
 
+# Aplicação WSGI para servidores como gunicorn: `gunicorn app:server`
+server = app.server
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8050)
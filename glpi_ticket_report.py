@@ -6,6 +6,8 @@ import os
 import requests
 import json
 from dotenv import load_dotenv
+from utils.glpi_http import glpi_request
+from utils.profiling import profile_run, start_phase
 
 # Load environment variables from a .env file if present
 load_dotenv()
@@ -33,24 +35,23 @@ def call_glpi_api(endpoint, method="GET", params=None, data=None):
     else: # Se o session_token ainda não foi obtido (apenas para initSession), usa user_token
         headers["Authorization"] = f"user_token {USER_TOKEN}"
 
+    # glpi_request aplica rate limit, concorrência adaptativa e retry com backoff
     try:
-        response = requests.request(method, url, headers=headers, params=params, json=data)
-        response.raise_for_status() # Lança um erro para status 4xx/5xx 
-
-        # Tenta retornar JSON. Se falhar, imprime o conteúdo e retorna None. 
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            print(f"Aviso: Resposta da API para {endpoint} não é um JSON válido.")
-            print(f"       Status Code: {response.status_code}, Conteúdo Bruto: {response.text[:500]}...")
-            return None # Retorna None se não for JSON válido 
-
+        response = glpi_request(method, url, headers=headers, params=params, json=data)
     except requests.exceptions.RequestException as e:
         print(f"Erro ao chamar a API GLPI no endpoint {endpoint}: {e}")
-        if response is not None:
-            print(f"Status Code: {response.status_code}, Response: {response.text}")
+        if e.response is not None:
+            print(f"Status Code: {e.response.status_code}, Response: {e.response.text}")
         return None
 
+    # Tenta retornar JSON. Se falhar, imprime o conteúdo e retorna None. 
+    try:
+        return response.json()
+    except json.JSONDecodeError:
+        print(f"Aviso: Resposta da API para {endpoint} não é um JSON válido.")
+        print(f"       Status Code: {response.status_code}, Conteúdo Bruto: {response.text[:500]}...")
+        return None # Retorna None se não for JSON válido 
+
 # --- Nova função para descoberta dinâmica de campos de grupo ---
 def discover_group_field():
     """
@@ -234,6 +235,7 @@ def main():
     print("Iniciando consulta à API do GLPI...\n")
 
     # --- 0. Inicializar a Sessão e obter o Session-Token ---
+    start_phase("sessão")
     print("0. Inicializando sessão para obter Session-Token...")
     init_session_headers = {
         "App-Token": APP_TOKEN,
@@ -241,8 +243,7 @@ def main():
         "Content-Type": "application/json"
     }
     try:
-        init_response = requests.get(f"{GLPI_URL}initSession", headers=init_session_headers)
-        init_response.raise_for_status()
+        init_response = glpi_request("GET", f"{GLPI_URL}initSession", headers=init_session_headers)
         session_data = init_response.json()
         SESSION_TOKEN = session_data.get("session_token")
         if not SESSION_TOKEN:
@@ -251,13 +252,14 @@ def main():
         print(f"  Session-Token obtido com sucesso: {SESSION_TOKEN[:10]}...\n")
     except requests.exceptions.RequestException as e:
         print(f"Erro fatal ao iniciar a sessão GLPI: {e}")
-        if init_response is not None:
-            print(f"Status Code: {init_response.status_code}, Response: {init_response.text}")
+        if e.response is not None:
+            print(f"Status Code: {e.response.status_code}, Response: {e.response.text}")
         return
 
     # A partir daqui, todas as chamadas `call_glpi_api` usarão o `SESSION_TOKEN`
 
     # 1. Obter nomes internos dos campos para Ticket (para exibir título e status)
+    start_phase("descoberta de esquema")
     print("1. Buscando searchOptions para Ticket (para metadados básicos)...")
     ticket_options_raw = call_glpi_api("listSearchOptions/Ticket")
     if not ticket_options_raw:
@@ -320,6 +322,7 @@ def main():
     print(f"  Campo de Group (display): Nome={group_name_field_for_display}\n")
 
     # 4. Buscar todos os Tickets
+    start_phase("busca de tickets")
     print("4. Buscando todos os Tickets...")
     # Explicitamente solicitar os campos necessários na busca de tickets
     # O "field" 'id' é crucial para identificar o ticket.
@@ -340,6 +343,7 @@ def main():
 
     # Iterar sobre cada Ticket
     for ticket in tickets:
+        start_phase("resolução por ticket")
         # Acessar os dados do ticket usando os 'field's internos, não os 'name's que são para display
         ticket_id = ticket.get('id') # Agora esperamos que 'id' esteja presente 
         ticket_title = ticket.get('name')
@@ -448,6 +452,7 @@ def main():
         print("-" * 30)
 
     # --- Gerar Tabela Markdown ---
+    start_phase("saída")
     print("\n--- Tabela de Resultados ---\n")
     if not results_table:
         print("Nenhum ticket processado para gerar a tabela.")
@@ -468,4 +473,5 @@ def main():
     print(f"Tickets com atribuições de grupo encontradas: {len([r for r in results_table if r['Group ID'] != 'N/A'])}")
 
 if __name__ == "__main__":
-    main()
+    with profile_run("glpi_ticket_report"):
+        main()
@@ -0,0 +1,398 @@
+"""
+Teste de carga do painel: simula N usuários simultâneos alterando o
+`date-range` e disparando os callbacks Dash pelo endpoint HTTP real
+`/_dash-update-component`.
+
+Por padrão sobe um GLPI falso (utils/fake_glpi.py) e o app Dash em processos
+separados, em portas livres: o app roda no gunicorn (--workers/--threads) se
+estiver instalado, senão no servidor do Dash. --server inprocess roda tudo no
+mesmo processo (mais simples, mas as latências incluem a disputa pelo GIL com
+o gerador de carga). Com --url, ataca um painel já em execução.
+
+Exemplos:
+    python load_test.py --users 20 --duration 60
+    python load_test.py --users 40 --workers 4 --threads 2
+    python load_test.py --users 50 --glpi-latency-ms 80 --json resultado.json
+    python load_test.py --url http://localhost:8050 --users 10
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+import requests
+from dotenv import load_dotenv
+
+from utils.fake_glpi import start_fake_glpi
+
+PROJECT_DIR = Path(__file__).resolve().parent
+DATE_PICKER_ID = "date-range"
+UPDATE_ENDPOINT = "/_dash-update-component"
+DEPENDENCIES_ENDPOINT = "/_dash-dependencies"
+
+# Servidor de desenvolvimento do Dash sem debug e sem log por requisição
+WERKZEUG_RUNNER = (
+    "import logging, sys; logging.getLogger('werkzeug').setLevel(logging.ERROR); "
+    "from app import app; "
+    "app.run(host='127.0.0.1', port=int(sys.argv[1]), debug=False, threaded=True)"
+)
+
+# Distribuição dos intervalos escolhidos pelos usuários: (peso, duração em dias)
+RANGE_DISTRIBUTION = [
+    (10, 1),    # apenas um dia
+    (45, 7),    # última semana
+    (25, 30),   # último mês
+    (10, 90),   # último trimestre
+    (10, None), # intervalo arbitrário (1 a 180 dias)
+]
+
+
+def random_date_range(rng: random.Random, anchor: date) -> tuple[str, str]:
+    """
+    Sorteia um intervalo (início, fim) em AAAA-MM-DD. O fim tende a ficar perto
+    de `anchor` (usuários olham sobretudo para dados recentes).
+    """
+    weights, spans = zip(*RANGE_DISTRIBUTION)
+    span = rng.choices(spans, weights=weights)[0] or rng.randint(1, 180)
+    end = anchor - timedelta(days=min(int(rng.expovariate(1 / 5)), 60))
+    start = end - timedelta(days=span - 1)
+    return start.isoformat(), end.isoformat()
+
+
+def parse_outputs(output: str) -> list[dict] | dict:
+    """Converte a string de output do Dash ('id.prop' ou '..a.x...b.y..')."""
+    def split(item):
+        component_id, _, prop = item.rpartition(".")
+        return {"id": component_id, "property": prop}
+
+    if output.startswith(".."):
+        return [split(item) for item in output[2:-2].split("...")]
+    return split(output)
+
+
+def discover_callbacks(base_url: str) -> list[dict]:
+    """Retorna os callbacks do app que têm o seletor de datas como Input."""
+    resp = requests.get(base_url + DEPENDENCIES_ENDPOINT, timeout=30)
+    resp.raise_for_status()
+    callbacks = []
+    for dep in resp.json():
+        if dep.get("clientside_function"):
+            continue
+        ids = [i["id"] for i in dep["inputs"] + dep.get("state", [])]
+        # Callbacks com IDs por padrão (dict) não são suportados
+        if any(not isinstance(i, str) for i in ids):
+            continue
+        if DATE_PICKER_ID in ids:
+            callbacks.append(dep)
+    return callbacks
+
+
+def build_payload(dep: dict, start_date: str, end_date: str) -> dict:
+    values = {"start_date": start_date, "end_date": end_date}
+
+    def with_value(item):
+        value = values.get(item["property"]) if item["id"] == DATE_PICKER_ID else None
+        return {"id": item["id"], "property": item["property"], "value": value}
+
+    return {
+        "output": dep["output"],
+        "outputs": parse_outputs(dep["output"]),
+        "inputs": [with_value(i) for i in dep["inputs"]],
+        "state": [with_value(s) for s in dep.get("state", [])],
+        "changedPropIds": [f"{DATE_PICKER_ID}.start_date", f"{DATE_PICKER_ID}.end_date"],
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank sobre uma lista já ordenada."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Acumula latências e erros por callback de forma thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = defaultdict(list)
+
+    def record(self, name: str, latency: float, error: str | None = None) -> None:
+        with self._lock:
+            self.latencies[name].append(latency)
+            if error:
+                self.errors[name] += 1
+                if len(self.error_samples[name]) < 3:
+                    self.error_samples[name].append(error)
+
+    def summary(self, elapsed: float) -> dict:
+        def stats(latencies, errors):
+            ordered = sorted(latencies)
+            count = len(ordered)
+            return {
+                "requests": count,
+                "errors": errors,
+                "error_rate": errors / count if count else 0.0,
+                "throughput_rps": count / elapsed if elapsed else 0.0,
+                "mean_ms": 1000 * sum(ordered) / count if count else float("nan"),
+                "p50_ms": 1000 * percentile(ordered, 50),
+                "p95_ms": 1000 * percentile(ordered, 95),
+                "p99_ms": 1000 * percentile(ordered, 99),
+                "max_ms": 1000 * ordered[-1] if ordered else float("nan"),
+            }
+
+        with self._lock:
+            per_callback = {name: stats(lat, self.errors[name])
+                            for name, lat in self.latencies.items()}
+            all_latencies = [v for lat in self.latencies.values() for v in lat]
+            total = stats(all_latencies, sum(self.errors.values()))
+            samples = {k: list(v) for k, v in self.error_samples.items()}
+        return {"elapsed_s": elapsed, "total": total,
+                "callbacks": per_callback, "error_samples": samples}
+
+
+def simulate_user(user_id: int, base_url: str, callbacks: list[dict],
+                  recorder: Recorder, deadline: float, anchor: date,
+                  think_time: float, seed: int | None, timeout: float) -> None:
+    """Um usuário: escolhe um intervalo, dispara os callbacks, 'pensa', repete."""
+    rng = random.Random(None if seed is None else seed + user_id)
+    session = requests.Session()
+    url = base_url + UPDATE_ENDPOINT
+    while time.monotonic() < deadline:
+        start_date, end_date = random_date_range(rng, anchor)
+        for dep in callbacks:
+            payload = build_payload(dep, start_date, end_date)
+            t0 = time.perf_counter()
+            error = None
+            try:
+                resp = session.post(url, json=payload, timeout=timeout)
+                if resp.status_code >= 400:
+                    error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+            except requests.exceptions.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+            recorder.record(dep["output"], time.perf_counter() - t0, error)
+        if think_time:
+            time.sleep(rng.expovariate(1 / think_time))
+
+
+def run_load(base_url: str, users: int, duration: float, anchor: date,
+             think_time: float = 1.0, ramp_up: float = 0.0,
+             seed: int | None = None, timeout: float = 60.0) -> dict:
+    callbacks = discover_callbacks(base_url)
+    if not callbacks:
+        raise RuntimeError(f"Nenhum callback com Input '{DATE_PICKER_ID}' encontrado em {base_url}")
+    print(f"Callbacks exercitados: {', '.join(dep['output'] for dep in callbacks)}")
+
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + duration
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        futures = []
+        for user_id in range(users):
+            futures.append(pool.submit(simulate_user, user_id, base_url, callbacks,
+                                       recorder, deadline, anchor, think_time,
+                                       seed, timeout))
+            if ramp_up:
+                time.sleep(ramp_up / users)
+        for future in futures:
+            future.result()
+    return recorder.summary(time.monotonic() - started)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen | None = None,
+                     timeout: float = 60.0) -> None:
+    """Espera `url` responder (qualquer status HTTP) ou o processo morrer."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Processo {process.args!r} terminou com código {process.returncode}")
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} não respondeu em {timeout:.0f}s")
+
+
+def fake_glpi_env(glpi_url: str) -> dict:
+    """Ambiente do painel apontando para o GLPI falso, nunca para o GLPI de produção."""
+    env = dict(os.environ)
+    env.setdefault("DEFAULT_START_DATE", (date.today() - timedelta(days=6)).isoformat())
+    env.setdefault("DEFAULT_END_DATE", date.today().isoformat())
+    # Substitui as credenciais reais do .env (load_dotenv não sobrescreve o ambiente)
+    env["GLPI_API_URL"] = glpi_url
+    env["GLPI_APP_TOKEN"] = "fake-app-token"
+    env["GLPI_USER_TOKEN"] = "fake-user-token"
+    return env
+
+
+def start_fake_glpi_process(args, end_date: str) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    cmd = [sys.executable, "-m", "utils.fake_glpi", "--port", str(port),
+           "--tickets", str(args.glpi_tickets), "--end-date", end_date,
+           "--latency-ms", str(args.glpi_latency_ms),
+           "--error-rate", str(args.glpi_error_rate)]
+    if args.seed is not None:
+        cmd += ["--seed", str(args.seed)]
+    process = subprocess.Popen(cmd, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/apirest.php"
+    wait_until_ready(url + "/initSession", process)
+    print(f"GLPI falso em {url} ({args.glpi_tickets} tickets)")
+    return process, url
+
+
+def start_dashboard_process(args, env: dict) -> tuple[subprocess.Popen, str]:
+    """Sobe o painel em outro processo, com gunicorn (N workers) ou o servidor do Dash."""
+    port = free_port()
+    if args.server == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "app:server",
+               "--bind", f"127.0.0.1:{port}",
+               "--workers", str(args.workers), "--threads", str(args.threads),
+               "--timeout", str(int(args.timeout) + 30)]
+        desc = f"gunicorn, {args.workers} worker(s) x {args.threads} thread(s)"
+    else:
+        cmd = [sys.executable, "-c", WERKZEUG_RUNNER, str(port)]
+        desc = "servidor de desenvolvimento do Dash"
+    process = subprocess.Popen(cmd, cwd=PROJECT_DIR, env=env)
+    url = f"http://127.0.0.1:{port}"
+    wait_until_ready(url + DEPENDENCIES_ENDPOINT, process, timeout=120)
+    print(f"Painel Dash em {url} ({desc})")
+    return process, url
+
+
+def start_inprocess_dashboard(glpi_url: str) -> str:
+    """
+    Sobe o app Dash neste processo. Clientes e servidor disputam o mesmo GIL,
+    então as latências medidas incluem a contenção do próprio gerador de carga.
+    """
+    os.environ.update(fake_glpi_env(glpi_url))
+    # Importado só agora: utils.data abre a sessão GLPI na importação
+    from werkzeug.serving import make_server
+    from app import app
+
+    # Sem log por requisição, como no WERKZEUG_RUNNER
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app.server, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    print(f"Painel Dash em {url} (no mesmo processo do gerador de carga)")
+    return url
+
+
+def start_local_dashboard(args, processes: list) -> str:
+    """Sobe o GLPI falso e o painel; retorna a URL do painel."""
+    end_date = os.getenv("DEFAULT_END_DATE") or date.today().isoformat()
+    if args.server == "inprocess":
+        glpi = start_fake_glpi(tickets=args.glpi_tickets, end_date=end_date,
+                               latency_ms=args.glpi_latency_ms,
+                               error_rate=args.glpi_error_rate, seed=args.seed)
+        print(f"GLPI falso em {glpi.base_url} ({args.glpi_tickets} tickets)")
+        return start_inprocess_dashboard(glpi.base_url)
+
+    glpi_process, glpi_url = start_fake_glpi_process(args, end_date)
+    processes.append(glpi_process)
+    dashboard_process, url = start_dashboard_process(args, fake_glpi_env(glpi_url))
+    processes.append(dashboard_process)
+    return url
+
+
+def print_report(summary: dict) -> None:
+    header = f"{'callback':<40} {'req':>7} {'err%':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+
+    def line(name, s):
+        return (f"{name[:40]:<40} {s['requests']:>7} {100 * s['error_rate']:>6.2f} "
+                f"{s['throughput_rps']:>8.2f} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} "
+                f"{s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}")
+
+    print(f"\n--- Resultado ({summary['elapsed_s']:.1f}s) ---")
+    print(header)
+    print("-" * len(header))
+    for name, stats in summary["callbacks"].items():
+        print(line(name, stats))
+    print("-" * len(header))
+    print(line("TOTAL", summary["total"]))
+    for name, samples in summary["error_samples"].items():
+        print(f"\nExemplos de erro em {name}:")
+        for sample in samples:
+            print(f"  {sample}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga dos callbacks do painel Dash.")
+    parser.add_argument("--url", help="Painel já em execução (ex.: http://localhost:8050). "
+                                      "Se omitido, sobe GLPI falso + app localmente.")
+    parser.add_argument("--server", choices=["gunicorn", "werkzeug", "inprocess"], default=None,
+                        help="Como subir o painel local: gunicorn (padrão se instalado), "
+                             "servidor do Dash em subprocesso, ou no mesmo processo do gerador")
+    parser.add_argument("--workers", type=int, default=2, help="Workers do gunicorn")
+    parser.add_argument("--threads", type=int, default=4, help="Threads por worker do gunicorn")
+    parser.add_argument("--users", type=int, default=10, help="Usuários simultâneos")
+    parser.add_argument("--duration", type=float, default=30.0, help="Duração do teste em segundos")
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="Pausa média (s) entre interações de um usuário; 0 = sem pausa")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Segundos para iniciar todos os usuários")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout por requisição (s)")
+    parser.add_argument("--anchor-date", default=None,
+                        help="Data de referência dos intervalos (padrão: DEFAULT_END_DATE ou hoje)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--glpi-tickets", type=int, default=1000, help="Tickets gerados pelo GLPI falso")
+    parser.add_argument("--glpi-latency-ms", type=float, default=0.0, help="Latência média do GLPI falso")
+    parser.add_argument("--glpi-error-rate", type=float, default=0.0, help="Fração de HTTP 500 do GLPI falso")
+    parser.add_argument("--json", dest="json_path", help="Grava o resumo em JSON neste arquivo")
+    args = parser.parse_args()
+
+    if args.server is None:
+        args.server = "gunicorn" if importlib.util.find_spec("gunicorn") else "werkzeug"
+        if args.server == "werkzeug" and not args.url:
+            print("gunicorn não instalado; usando o servidor do Dash em subprocesso "
+                  "(pip install gunicorn para testar com vários workers)")
+
+    load_dotenv()
+    processes = []
+    try:
+        base_url = args.url.rstrip("/") if args.url else start_local_dashboard(args, processes)
+        anchor_str = args.anchor_date or os.getenv("DEFAULT_END_DATE")
+        anchor = date.fromisoformat(anchor_str) if anchor_str else date.today()
+
+        print(f"Iniciando {args.users} usuários por {args.duration:.0f}s contra {base_url}...")
+        summary = run_load(base_url, args.users, args.duration, anchor,
+                           think_time=args.think_time, ramp_up=args.ramp_up,
+                           seed=args.seed, timeout=args.timeout)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    print_report(summary)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nResumo gravado em {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import random
+
+import pytest
+import requests
+
+from utils import glpi_http
+from utils.glpi_http import AdaptiveConcurrencyLimiter, GLPIRequester
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def feed(limiter, clock, latencies, endpoint="/apirest.php/Ticket"):
+    """Passa respostas saudáveis sequenciais pelo limiter; retorna o limite após cada uma."""
+    limits = []
+    for latency in latencies:
+        with limiter.slot(endpoint) as outcome:
+            clock.now += latency
+            outcome.record(overloaded=False)
+        limits.append(limiter.limit)
+    return limits
+
+
+def make_limiter():
+    clock = FakeClock()
+    return AdaptiveConcurrencyLimiter(8, 1, 8, 2.0, clock=clock), clock
+
+
+def test_limit_stays_at_max_under_steady_noisy_latency():
+    for seed in range(3):
+        rng = random.Random(seed)
+        limiter, clock = make_limiter()
+        limits = feed(limiter, clock, [rng.expovariate(1 / 0.05) for _ in range(2000)])
+        assert min(limits) == 8
+
+
+def test_limit_shrinks_on_slowdown_and_recovers_only_after_it():
+    limiter, clock = make_limiter()
+    feed(limiter, clock, [0.05] * 100)
+    assert limiter.limit == 8
+
+    slow = feed(limiter, clock, [0.5] * 100)
+    assert slow[-1] == 1
+    # Uma lentidão prolongada não vira a nova linha de base
+    assert max(slow[10:]) == 1
+
+    recovered = feed(limiter, clock, [0.05] * 100)
+    assert recovered[-1] == 8
+
+
+def test_limit_recovers_after_a_permanent_slowdown():
+    limiter, clock = make_limiter()
+    feed(limiter, clock, [0.05] * 100)
+
+    slow = feed(limiter, clock, [0.5] * 2000)
+    # Preso no mínimo enquanto a lentidão pode ser passageira...
+    assert max(slow[10:100]) == 1
+    # ...e de volta ao máximo depois de aceita a nova linha de base
+    assert slow[-1] == 8
+    assert min(slow[-1000:]) == 8
+
+
+def test_errors_halve_the_limit():
+    limiter, clock = make_limiter()
+    feed(limiter, clock, [0.05] * 30)
+    with limiter.slot("/apirest.php/Ticket") as outcome:
+        clock.now += 0.05
+        outcome.record(overloaded=True)
+    assert limiter.limit == 4
+
+
+def test_rate_limit_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("GLPI_RATE_LIMIT", raising=False)
+    assert GLPIRequester.from_env().bucket.rate == 0
+
+
+class StubSession:
+    """Devolve (ou levanta) os resultados enfileirados, um por requisição."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.url = "http://glpi.example/apirest.php/Ticket"
+    response._content = b"{}"
+    return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(glpi_http.time, "sleep", delays.append)
+    return delays
+
+
+def make_requester(**kwargs):
+    return GLPIRequester(**{"max_retries": 2, "backoff_base": 0.01, "backoff_max": 5.0, **kwargs})
+
+
+@pytest.mark.parametrize("retry_after, expected", [("2", 2.0), ("100", 5.0)])
+def test_retry_after_is_honoured_and_capped(sleeps, retry_after, expected):
+    session = StubSession(make_response(429, {"Retry-After": retry_after}), make_response(200))
+    response = make_requester().request("GET", "http://glpi.example/apirest.php/Ticket", session=session)
+    assert response.status_code == 200
+    assert sleeps == [expected]
+
+
+def test_server_errors_are_retried_then_raised(sleeps):
+    session = StubSession(make_response(503))
+    with pytest.raises(requests.HTTPError) as excinfo:
+        make_requester().request("GET", "http://glpi.example/apirest.php/Ticket", session=session)
+    assert excinfo.value.response.status_code == 503
+    assert len(session.calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_post_is_not_retried_on_timeout(sleeps):
+    session = StubSession(requests.exceptions.ReadTimeout("lento"))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        make_requester().request("POST", "http://glpi.example/apirest.php/Ticket", session=session)
+    assert session.calls == ["POST"]
+    assert sleeps == []
+
+
+def test_client_errors_are_not_retried(sleeps):
+    session = StubSession(make_response(404))
+    with pytest.raises(requests.HTTPError):
+        make_requester().request("GET", "http://glpi.example/apirest.php/Ticket", session=session)
+    assert len(session.calls) == 1
+    assert sleeps == []
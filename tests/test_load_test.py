@@ -0,0 +1,58 @@
+import random
+from datetime import date
+
+from load_test import build_payload, parse_outputs, percentile, random_date_range
+
+
+def test_parse_single_output():
+    assert parse_outputs("cards-row.children") == {"id": "cards-row", "property": "children"}
+
+
+def test_parse_multi_output():
+    assert parse_outputs("..graph-a.figure...graph-b.figure..") == [
+        {"id": "graph-a", "property": "figure"},
+        {"id": "graph-b", "property": "figure"},
+    ]
+
+
+def test_build_payload_fills_date_picker_values():
+    dep = {
+        "output": "cards-row.children",
+        "inputs": [{"id": "date-range", "property": "start_date"},
+                   {"id": "date-range", "property": "end_date"}],
+        "state": [{"id": "other", "property": "value"}],
+    }
+    payload = build_payload(dep, "2025-06-01", "2025-06-07")
+
+    assert payload["outputs"] == {"id": "cards-row", "property": "children"}
+    assert [i["value"] for i in payload["inputs"]] == ["2025-06-01", "2025-06-07"]
+    assert payload["state"] == [{"id": "other", "property": "value", "value": None}]
+    assert payload["changedPropIds"] == ["date-range.start_date", "date-range.end_date"]
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile(values, 0) == 1
+    assert percentile([7.0], 95) == 7
+
+
+def test_percentile_of_empty_list_is_nan():
+    assert percentile([], 50) != percentile([], 50)
+
+
+def test_random_date_range_spans_stay_within_distribution():
+    rng = random.Random(0)
+    anchor = date(2025, 6, 18)
+    spans = []
+    for _ in range(2000):
+        start, end = (date.fromisoformat(d) for d in random_date_range(rng, anchor))
+        assert start <= end <= anchor
+        spans.append((end - start).days + 1)
+
+    assert min(spans) >= 1 and max(spans) <= 180
+    # "Última semana" tem peso 45 de 100
+    weekly = spans.count(7) / len(spans)
+    assert 0.40 <= weekly <= 0.52
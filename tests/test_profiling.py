@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from utils import profiling
+
+
+@pytest.fixture
+def profile_env(monkeypatch, tmp_path):
+    """Define o ambiente depois da importação, como faz o load_dotenv do app."""
+    monkeypatch.setenv("PROFILE_MODE", "cprofile")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    profiling.settings.cache_clear()
+    yield tmp_path
+    profiling.settings.cache_clear()
+
+
+def read_breakdown(directory):
+    (path,) = directory.glob("*.json")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_disabled_mode_leaves_callbacks_untouched(monkeypatch):
+    monkeypatch.delenv("PROFILE_MODE", raising=False)
+    profiling.settings.cache_clear()
+
+    def callback():
+        return 1
+
+    assert profiling.profile_callback(callback) is callback
+    profiling.settings.cache_clear()
+
+
+def test_environment_is_read_at_first_use(profile_env):
+    wrapped = profiling.profile_callback(lambda: 42)
+    assert wrapped() == 42
+    assert read_breakdown(profile_env)["mode"] == "cprofile"
+
+
+def test_nested_phases_are_recorded_by_path(profile_env):
+    with profiling.profile_run("report"):
+        profiling.start_phase("descoberta")
+        with profiling.phase("carregar dados"):
+            with profiling.phase("busca GLPI"):
+                pass
+        for _ in range(3):
+            profiling.start_phase("resolução por ticket")
+        profiling.start_phase("saída")
+
+    phases = read_breakdown(profile_env)["phases"]
+    assert set(phases) == {
+        "descoberta",
+        "descoberta/carregar dados",
+        "descoberta/carregar dados/busca GLPI",
+        "resolução por ticket",
+        "saída",
+    }
+    assert phases["resolução por ticket"]["calls"] == 3
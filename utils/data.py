@@ -1,9 +1,14 @@
 from pathlib import Path
 from dotenv import load_dotenv
+import logging
 import os
 import requests
 import pandas as pd
 from functools import lru_cache
+from utils.glpi_http import glpi_request
+from utils.profiling import phase
+
+logger = logging.getLogger(__name__)
 
 # Carrega variáveis de ambiente do .env na raiz do projeto
 env_path = Path(__file__).parent.parent / ".env"
@@ -34,8 +39,7 @@ session.headers.update({k: v for k, v in headers.items() if v is not None})
 
 # Inicia sessão GLPI para obter session_token
 init_url = f"{API_URL}/initSession"
-resp = session.get(init_url)
-resp.raise_for_status()
+resp = glpi_request("GET", init_url, session=session)
 data = resp.json()
 SESSION_TOKEN = data.get("session_token")
 if not SESSION_TOKEN:
@@ -48,13 +52,14 @@ def fetch_glpi_tickets(start_date: str | None = None,
     """
     Busca todos tickets via GET /Ticket e filtra localmente pelo campo de data.
     Usa o primeiro campo de data encontrado entre 'date_creation', 'date', 'date_mod'.
+    Falhas transitórias são repetidas por utils.glpi_http; esgotadas as
+    tentativas, o erro é propagado.
     """
     start = start_date or DEFAULT_START_DATE
     end   = end_date   or DEFAULT_END_DATE
 
     url = f"{API_URL}/Ticket?range=0-1000"
-    resp = session.get(url)
-    resp.raise_for_status()
+    resp = glpi_request("GET", url, session=session)
     tickets = resp.json()
 
     filtered = []
@@ -77,7 +82,8 @@ def load_data(start_date: str | None = None,
     Carrega tickets filtrados e retorna DataFrame agregado por nível:
     ['Nível', 'Novos', 'Em Atendimento', 'Resolvidos', 'Não Resolvidos']
     """
-    tickets = fetch_glpi_tickets(start_date, end_date)
+    with phase("busca GLPI"):
+        tickets = fetch_glpi_tickets(start_date, end_date)
     if not tickets:
         # retorna DataFrame com zeros para cada nível
         return pd.DataFrame({
@@ -110,8 +116,9 @@ def load_data(start_date: str | None = None,
         if col not in pivot:
             pivot[col] = 0
 
-    print(df.head())
-    print(pivot)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tickets:\n%s", df.head())
+        logger.debug("Pivot:\n%s", pivot)
 
     result = pivot.reset_index().rename_axis(columns=None)
     return result
@@ -0,0 +1,143 @@
+"""
+Servidor GLPI falso, apenas para testes locais e de carga.
+
+Implementa o mínimo da API REST usado pelo painel (initSession, killSession e
+GET /Ticket), gerando tickets sintéticos e, opcionalmente, latência e erros
+artificiais para simular um GLPI sob carga.
+
+Uso isolado:
+    python -m utils.fake_glpi --port 8080 --tickets 2000 --latency-ms 50
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LEVELS = ["N1", "N2", "N3", "N4"]
+STATUSES = [1, 2, 3, 4]
+
+
+def generate_tickets(count: int, end_date: str, days: int,
+                     seed: int | None = None) -> list[dict]:
+    """
+    Gera `count` tickets com 'date_creation' espalhada nos `days` dias
+    anteriores a `end_date` (AAAA-MM-DD), nível em N1..N4 e status 1..4.
+    """
+    rng = random.Random(seed)
+    end = date.fromisoformat(end_date)
+    tickets = []
+    for i in range(1, count + 1):
+        created = datetime.combine(end - timedelta(days=rng.randrange(days)),
+                                   datetime.min.time())
+        created += timedelta(seconds=rng.randrange(24 * 3600))
+        tickets.append({
+            "id": i,
+            "name": f"Chamado sintético {i}",
+            "date_creation": created.strftime("%Y-%m-%d %H:%M:%S"),
+            "itilcategories_id": rng.choices(LEVELS, weights=[50, 30, 15, 5])[0],
+            "status": rng.choice(STATUSES),
+        })
+    return tickets
+
+
+class FakeGLPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, tickets: list[dict],
+                 latency_ms: float = 0.0, error_rate: float = 0.0):
+        super().__init__(address, FakeGLPIHandler)
+        self.tickets = tickets
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/apirest.php"
+
+    def start(self) -> threading.Thread:
+        """Atende requisições numa thread daemon e retorna essa thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class FakeGLPIHandler(BaseHTTPRequestHandler):
+    server: FakeGLPIServer
+
+    def log_message(self, format, *args):
+        # Silencia o log por requisição; sob carga ele domina a saída.
+        pass
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv = self.server
+        if srv.latency_ms:
+            # Latência exponencial em torno da média configurada
+            time.sleep(random.expovariate(1000.0 / srv.latency_ms))
+        if srv.error_rate and random.random() < srv.error_rate:
+            self._send_json(500, ["ERROR", "Erro simulado pelo GLPI falso"])
+            return
+
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint == "initSession":
+            self._send_json(200, {"session_token": "fake-session-token"})
+        elif endpoint == "killSession":
+            self._send_json(200, [])
+        elif endpoint == "Ticket":
+            rng = parse_qs(url.query).get("range", ["0-50"])[0]
+            first, _, last = rng.partition("-")
+            self._send_json(200, srv.tickets[int(first):int(last or first) + 1])
+        else:
+            self._send_json(404, ["ERROR_RESOURCE_NOT_FOUND_NOR_COMMONDBTM", endpoint])
+
+
+def start_fake_glpi(host: str = "127.0.0.1", port: int = 0, *,
+                    tickets: int = 500, end_date: str | None = None,
+                    days: int = 180, latency_ms: float = 0.0,
+                    error_rate: float = 0.0, seed: int | None = None) -> FakeGLPIServer:
+    """Cria e inicia o servidor falso em segundo plano (porta 0 = porta livre)."""
+    data = generate_tickets(tickets, end_date or date.today().isoformat(), days, seed)
+    server = FakeGLPIServer((host, port), data, latency_ms, error_rate)
+    server.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor GLPI falso para testes locais.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--end-date", default=None, help="Data mais recente dos tickets (AAAA-MM-DD)")
+    parser.add_argument("--days", type=int, default=180, help="Janela de dias coberta pelos tickets")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latência média por requisição")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas HTTP 500")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = start_fake_glpi(args.host, args.port, tickets=args.tickets,
+                             end_date=args.end_date, days=args.days,
+                             latency_ms=args.latency_ms, error_rate=args.error_rate,
+                             seed=args.seed)
+    print(f"GLPI falso escutando em {server.base_url} (Ctrl+C para sair)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Camada única de requisições ao GLPI.
+
+Toda chamada passa por:
+  * um limite de concorrência adaptativo (AIMD): cresce +1/limite a cada
+    resposta saudável e cai pela metade quando a latência dispara ou o GLPI
+    responde 429/5xx/timeout. É ele que regula a carga sobre o GLPI;
+  * opcionalmente, um token bucket (teto fixo de requisições por segundo);
+  * retry com backoff exponencial e jitter ("full jitter") para 429, 5xx,
+    timeouts e falhas de conexão, respeitando o cabeçalho Retry-After.
+
+Configuração por variáveis de ambiente (todas opcionais):
+    GLPI_RATE_LIMIT          teto de requisições/s (padrão 0 = sem teto fixo)
+    GLPI_RATE_BURST          tamanho da rajada (padrão = GLPI_RATE_LIMIT)
+    GLPI_MAX_CONCURRENCY     teto de requisições simultâneas (padrão 8)
+    GLPI_MIN_CONCURRENCY     piso de requisições simultâneas (padrão 1)
+    GLPI_MAX_RETRIES         novas tentativas após a primeira (padrão 4)
+    GLPI_BACKOFF_BASE        backoff inicial em segundos (padrão 0.5)
+    GLPI_BACKOFF_MAX         backoff máximo em segundos (padrão 30)
+    GLPI_TIMEOUT             timeout por requisição em segundos (padrão 30)
+    GLPI_LATENCY_TOLERANCE   latência/linha de base que conta como sobrecarga (padrão 2.0)
+"""
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class TokenBucket:
+    """Limita a taxa de requisições; `acquire` bloqueia até haver um token."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de concorrência AIMD. Cada requisição ocupa um slot; ao liberar,
+    informa a latência e se o GLPI mostrou sinal de sobrecarga.
+
+    Por endpoint são mantidas duas médias móveis da latência: uma curta (o
+    estado atual) e uma longa (a linha de base). Há sobrecarga quando a curta
+    passa de `latency_tolerance` vezes a longa. A linha de base só aprende com
+    respostas saudáveis, então uma lentidão passageira não vira "normal": o
+    limite volta a crescer quando a latência volta para perto da base.
+
+    Se a lentidão persistir com o limite já no mínimo por RESEED_AFTER_RTTS
+    latências médias (e ao menos RESEED_MIN_SECONDS), a mudança é tratada como
+    permanente (troca de servidor, carga do expediente): a linha de base é
+    refeita com a latência atual e o limite volta a crescer.
+    """
+
+    SHORT_ALPHA = 0.05
+    BASELINE_ALPHA = 0.01
+    # Respostas usadas só para formar a linha de base, sem julgar sobrecarga
+    WARMUP_SAMPLES = 20
+    # Intervalo mínimo entre duas reduções, além de uma latência média atual
+    MIN_DECREASE_INTERVAL = 0.1
+    RESEED_AFTER_RTTS = 200
+    RESEED_MIN_SECONDS = 60.0
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 8,
+                 latency_tolerance: float = 2.0, clock=time.monotonic):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_tolerance = latency_tolerance
+        self._clock = clock
+        self._in_flight = 0
+        # Listar 1000 tickets é naturalmente mais lento que initSession, então
+        # cada endpoint tem suas próprias médias: {endpoint: [amostras, curta, base]}
+        self._latency = {}
+        self._last_decrease = None
+        # Desde quando o limite está no mínimo com latência acima da base
+        self._pinned_since = None
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def slot(self, endpoint: str = ""):
+        """Ocupa um slot; o chamador registra o resultado via `outcome.record(...)`."""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+        outcome = _SlotOutcome()
+        started = self._clock()
+        try:
+            yield outcome
+        finally:
+            latency = self._clock() - started
+            with self._cond:
+                self._in_flight -= 1
+                if outcome.overloaded is not None:
+                    self._update(endpoint, latency, outcome.overloaded)
+                self._cond.notify_all()
+
+    def _update(self, endpoint: str, latency: float, overloaded: bool) -> None:
+        stats = self._latency.get(endpoint)
+        if not overloaded:
+            if stats is None:
+                stats = self._latency[endpoint] = [0, latency, latency]
+            stats[0] += 1
+            stats[1] += (latency - stats[1]) * self.SHORT_ALPHA
+            if stats[0] <= self.WARMUP_SAMPLES:
+                # Média simples das primeiras respostas
+                stats[1] = stats[2] = stats[2] + (latency - stats[2]) / stats[0]
+            else:
+                overloaded = stats[1] > stats[2] * self.latency_tolerance
+                if not overloaded:
+                    stats[2] += (latency - stats[2]) * self.BASELINE_ALPHA
+                    self._pinned_since = None
+                elif self.limit <= self.minimum:
+                    overloaded = not self._reseed_if_pinned(endpoint, stats)
+
+        if overloaded:
+            # Uma redução por intervalo de ida e volta atual: respostas ruins da
+            # mesma leva de requisições não derrubam o limite várias vezes.
+            now = self._clock()
+            window = max(self.MIN_DECREASE_INTERVAL, stats[1] if stats else latency)
+            if self._last_decrease is None or now - self._last_decrease >= window:
+                old = self.limit
+                self.limit = max(self.minimum, self.limit / 2)
+                self._last_decrease = now
+                if int(self.limit) != int(old):
+                    logger.info("GLPI sobrecarregado: concorrência %d -> %d (%d em andamento)",
+                                int(old), int(self.limit), self.in_flight)
+        elif self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def _reseed_if_pinned(self, endpoint: str, stats: list) -> bool:
+        """Refaz a linha de base se o limite está preso no mínimo há tempo demais."""
+        now = self._clock()
+        if self._pinned_since is None:
+            self._pinned_since = now
+            return False
+        if now - self._pinned_since < max(self.RESEED_MIN_SECONDS, self.RESEED_AFTER_RTTS * stats[1]):
+            return False
+        logger.info("GLPI lento de forma persistente em %s: nova linha de base %.3fs (antes %.3fs)",
+                    endpoint, stats[1], stats[2])
+        stats[2] = stats[1]
+        self._pinned_since = None
+        return True
+
+
+class _SlotOutcome:
+    overloaded = None
+
+    def record(self, overloaded: bool) -> None:
+        self.overloaded = overloaded
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _retry_after(response: requests.Response | None) -> float | None:
+    """Segundos pedidos pelo cabeçalho Retry-After (número ou data HTTP)."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _endpoint_key(url: str) -> str:
+    """Caminho da URL sem IDs numéricos (User/12 e User/34 contam como User)."""
+    path = urlparse(url).path.rstrip("/")
+    return "/".join(part for part in path.split("/") if not part.isdigit())
+
+
+class GLPIRequester:
+    """Executa requisições HTTP ao GLPI com rate limit, concorrência adaptativa e retry."""
+
+    def __init__(self, rate: float = 0.0, burst: float | None = None,
+                 max_concurrency: int = 8, min_concurrency: int = 1,
+                 max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, timeout: float = 30.0,
+                 latency_tolerance: float = 2.0):
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency, min_concurrency,
+                                                  max_concurrency, latency_tolerance)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> "GLPIRequester":
+        rate = _env_float("GLPI_RATE_LIMIT", 0.0)
+        burst = os.getenv("GLPI_RATE_BURST")
+        return cls(
+            rate=rate,
+            burst=float(burst) if burst else None,
+            max_concurrency=int(_env_float("GLPI_MAX_CONCURRENCY", 8)),
+            min_concurrency=int(_env_float("GLPI_MIN_CONCURRENCY", 1)),
+            max_retries=int(_env_float("GLPI_MAX_RETRIES", 4)),
+            backoff_base=_env_float("GLPI_BACKOFF_BASE", 0.5),
+            backoff_max=_env_float("GLPI_BACKOFF_MAX", 30.0),
+            timeout=_env_float("GLPI_TIMEOUT", 30.0),
+            latency_tolerance=_env_float("GLPI_LATENCY_TOLERANCE", 2.0),
+        )
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def request(self, method: str, url: str, session: requests.Session | None = None,
+                **kwargs) -> requests.Response:
+        """
+        Faz a requisição e retorna a resposta de sucesso. Depois de esgotar as
+        tentativas, relança o último erro (HTTPError para status >= 400).
+        """
+        method = method.upper()
+        sender = session or requests
+        kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 + (self.max_retries if method in RETRY_METHODS else 0)
+
+        endpoint = _endpoint_key(url)
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            response = None
+            error = None
+            with self.limiter.slot(endpoint) as outcome:
+                try:
+                    response = sender.request(method, url, **kwargs)
+                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                    error = e
+                    outcome.record(overloaded=True)
+                else:
+                    outcome.record(overloaded=response.status_code in RETRY_STATUSES)
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+
+            attempt += 1
+            if attempt >= attempts:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+
+            delay = self.backoff(attempt - 1, _retry_after(response))
+            logger.warning("GLPI %s %s falhou (%s); tentativa %d/%d em %.2fs",
+                           method, url, error or f"HTTP {response.status_code}",
+                           attempt + 1, attempts, delay)
+            time.sleep(delay)
+
+
+_default_requester = None
+_default_lock = threading.Lock()
+
+
+def get_requester() -> GLPIRequester:
+    """Instância compartilhada, configurada pelo ambiente no primeiro uso."""
+    global _default_requester
+    with _default_lock:
+        if _default_requester is None:
+            _default_requester = GLPIRequester.from_env()
+        return _default_requester
+
+
+def glpi_request(method: str, url: str, session: requests.Session | None = None,
+                 **kwargs) -> requests.Response:
+    """Atalho para `get_requester().request(...)`."""
+    return get_requester().request(method, url, session=session, **kwargs)
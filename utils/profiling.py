@@ -0,0 +1,228 @@
+"""
+Perfilamento opcional de callbacks Dash e do relatório de tickets.
+
+Ativado por variável de ambiente, lida no primeiro uso (depois de o app ou o
+relatório carregarem o .env). Desativado, `profile_callback` devolve a própria
+função, `profile_run` e `phase` devolvem um contexto nulo e `start_phase` só
+consulta uma variável local da thread: nada é medido nem gravado.
+
+Os callbacks do painel são registrados em callbacks.py pelo `callback` local
+de `register_callbacks`, que já aplica `profile_callback`; novos callbacks
+devem usá-lo em vez de `app.callback` para serem perfilados.
+
+Fases podem ser sequenciais (`start_phase`, que encerra a anterior no mesmo
+nível) ou aninhadas (`with phase(...)`); as aninhadas são registradas pelo
+caminho completo, ex. "carregar dados/busca GLPI", com tempo inclusivo.
+
+    PROFILE_MODE              '' (desligado), 'cprofile' ou 'sample'
+    PROFILE_DIR               diretório dos artefatos (padrão: profiles/)
+    PROFILE_SAMPLE_INTERVAL   intervalo de amostragem em segundos (padrão 0.005)
+
+Cada execução perfilada grava em PROFILE_DIR:
+  * <nome>.prof    estatísticas do cProfile (abrir com pstats ou snakeviz), ou
+    <nome>.folded  pilhas amostradas no formato "collapsed" (flamegraph.pl,
+                   speedscope);
+  * <nome>.json    tempo total e tempo por fase.
+"""
+import cProfile
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+_local = threading.local()
+_run_ids = itertools.count(1)
+# A partir do Python 3.12 só um cProfile pode estar ativo por processo;
+# execuções simultâneas registram apenas as fases.
+_cprofile_lock = threading.Lock()
+_null = nullcontext()
+
+
+@functools.lru_cache(maxsize=None)
+def settings() -> tuple[str, Path, float]:
+    """(PROFILE_MODE, PROFILE_DIR, PROFILE_SAMPLE_INTERVAL), lidos no primeiro uso."""
+    mode = os.getenv("PROFILE_MODE", "").strip().lower()
+    if mode not in ("", "cprofile", "sample"):
+        raise ValueError("PROFILE_MODE deve ser vazio, 'cprofile' ou 'sample'")
+    directory = Path(os.getenv("PROFILE_DIR", "profiles"))
+    interval = float(os.getenv("PROFILE_SAMPLE_INTERVAL") or 0.005)
+    return mode, directory, interval
+
+
+def enabled() -> bool:
+    return bool(settings()[0])
+
+
+class _Sampler(threading.Thread):
+    """Amostra periodicamente a pilha de uma thread e conta pilhas iguais."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class ProfileRun:
+    """
+    Uma execução perfilada: mede o tempo total e de cada fase e grava os
+    artefatos ao sair do contexto.
+    """
+
+    def __init__(self, name: str, mode: str | None = None):
+        self.name = name
+        self.mode = settings()[0] if mode is None else mode
+        self.phases = {}
+        # Fases abertas: [caminho, início, aberta por start_phase]
+        self._stack = []
+        self._profiler = None
+        self._sampler = None
+        self._previous = None
+        self._started = 0.0
+
+    def start_phase(self, name: str) -> None:
+        """
+        Encerra a fase sequencial corrente do mesmo nível (se houver) e inicia
+        `name`; fases repetidas acumulam.
+        """
+        now = time.perf_counter()
+        if self._stack and self._stack[-1][2]:
+            self._close_top(now)
+        self._open(name, now, sequential=True)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Fase aninhada na fase corrente, registrada pelo caminho completo."""
+        self._open(name, time.perf_counter(), sequential=False)
+        depth = len(self._stack)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            # Fecha também as fases sequenciais iniciadas dentro do bloco
+            while len(self._stack) >= depth:
+                self._close_top(now)
+
+    def _open(self, name: str, now: float, sequential: bool) -> None:
+        path = f"{self._stack[-1][0]}/{name}" if self._stack else name
+        self._stack.append([path, now, sequential])
+
+    def _close_top(self, now: float) -> None:
+        path, started, _ = self._stack.pop()
+        entry = self.phases.setdefault(path, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += now - started
+        entry["calls"] += 1
+
+    def __enter__(self):
+        self._previous = getattr(_local, "run", None)
+        _local.run = self
+        if self.mode == "cprofile" and _cprofile_lock.acquire(blocking=False):
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == "sample":
+            self._sampler = _Sampler(threading.get_ident(), settings()[2])
+            self._sampler.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        now = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.disable()
+            _cprofile_lock.release()
+        if self._sampler is not None:
+            self._sampler.stop()
+        while self._stack:
+            self._close_top(now)
+        _local.run = self._previous
+        self.save(now - self._started, failed=exc_type is not None)
+        return False
+
+    def save(self, total: float, failed: bool = False) -> Path:
+        directory = settings()[1]
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.name}-{os.getpid()}-{next(_run_ids)}"
+        artifact = None
+        if self._profiler is not None:
+            artifact = directory / f"{stem}.prof"
+            self._profiler.dump_stats(artifact)
+        elif self._sampler is not None:
+            artifact = directory / f"{stem}.folded"
+            with open(artifact, "w", encoding="utf-8") as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        phases = {
+            name: {**entry, "percent": 100 * entry["seconds"] / total if total else 0.0}
+            for name, entry in self.phases.items()
+        }
+        summary = {
+            "name": self.name,
+            "mode": self.mode,
+            "total_seconds": total,
+            "failed": failed,
+            "phases": phases,
+            "profile": str(artifact) if artifact else None,
+        }
+        breakdown = directory / f"{stem}.json"
+        with open(breakdown, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        parts = ", ".join(f"{name} {entry['seconds']:.3f}s ({entry['percent']:.0f}%)"
+                          for name, entry in phases.items())
+        print(f"[perfil] {self.name}: {total:.3f}s" + (f" — {parts}" if parts else "")
+              + f" -> {breakdown}", file=sys.stderr)
+        return breakdown
+
+
+def profile_run(name: str):
+    """Contexto que perfila o bloco quando PROFILE_MODE está ativo."""
+    return ProfileRun(name) if enabled() else _null
+
+
+def start_phase(name: str) -> None:
+    """Marca o início de uma fase sequencial na execução perfilada da thread atual (se houver)."""
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.start_phase(name)
+
+
+def phase(name: str):
+    """Contexto de fase aninhada na execução perfilada da thread atual (se houver)."""
+    run = getattr(_local, "run", None)
+    return _null if run is None else run.phase(name)
+
+
+def profile_callback(func):
+    """Decorador para callbacks Dash; sem PROFILE_MODE devolve a própria função."""
+    if not enabled():
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with ProfileRun(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper